@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Security
+from fastapi import FastAPI, Request, Security
 from langfuse import Langfuse
 from langfuse.callback import CallbackHandler
 import os
@@ -121,13 +121,13 @@ class PromptEndpointGenerator:
         )
         self.logger.debug(f"Created request model for {prompt_name} with variables: {variables}")
 
-        async def handler(input_data: request_model):
+        async def handler(input_data: request_model, request: Request):
             self.logger.info(f"Handling request for prompt: {prompt_name}")
             api_key_info = self._extract_api_key(input_data)
 
             try:
                 result = await self.prompt_handler.handle_prompt(
-                    prompt_name, input_data, variables, api_key_info
+                    prompt_name, input_data, variables, api_key_info, request
                 )
                 self.logger.info(f"Successfully processed prompt: {prompt_name}")
                 return result
@@ -1,10 +1,12 @@
 from langchain.schema import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from langfuse import Langfuse
-from fastapi import HTTPException
-from typing import Dict, Any, List
+from fastapi import HTTPException, Request
+from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 import json
+import os
 from src.llm_factory import get_llm
 import traceback
 
@@ -16,7 +18,28 @@ class PromptHandler:
         self.langfuse = langfuse_client
         self.prompt_config = prompt_config
         self.logger = logger
-        self.logger.info("Initialized PromptHandler")
+        self.default_timeout = self._parse_timeout(os.getenv("PROMPT_TIMEOUT", "60"))
+        self.logger.info(
+            f"Initialized PromptHandler (default timeout: {self.default_timeout}s)"
+        )
+
+    @staticmethod
+    def _parse_timeout(value) -> Optional[float]:
+        """Convert a timeout setting to seconds, None or non-positive disables it."""
+        if value is None or value == "":
+            return None
+        timeout = float(value)
+        return timeout if timeout > 0 else None
+
+    def _get_timeout(self, prompt_name: str, is_chat: bool) -> Optional[float]:
+        """Get the deadline for a prompt from its Langfuse config, falling back to the global default."""
+        langfuse_prompt = self.langfuse.get_prompt(
+            prompt_name, type="chat" if is_chat else "text"
+        )
+        config = langfuse_prompt.config or {}
+        if "timeout" not in config:
+            return self.default_timeout
+        return self._parse_timeout(config["timeout"])
 
     def _create_chain(self, prompt_name: str, is_chat: bool, api_key: str):
         """Create a Langchain chain from Langfuse prompt"""
@@ -125,7 +148,50 @@ class PromptHandler:
             metadata={"interface": "Swagger"},
         )
 
-    async def handle_prompt(self, prompt_name: str, input_data: Any, variables: List[str], api_key: str):
+    async def _wait_for_disconnect(self, request: Request, interval: float = 0.5):
+        """Return once the client has disconnected."""
+        while not await request.is_disconnected():
+            await asyncio.sleep(interval)
+
+    def _record_abort(self, trace, generation, status: str, message: str):
+        """Mark the generation and trace as timed out or cancelled."""
+        generation.end(level="ERROR", status_message=message)
+        trace.update(output={"status": status, "detail": message}, metadata={"status": status})
+
+    async def _invoke_with_deadline(self, chain, input_dict: dict, timeout: Optional[float], request: Optional[Request]):
+        """
+        Run the chain until it finishes, the deadline passes or the client disconnects.
+
+        Returns:
+            tuple: (status, response) where status is "ok", "timeout" or "cancelled"
+        """
+        invoke_task = asyncio.create_task(chain.ainvoke(input=input_dict))
+        tasks = {invoke_task}
+        if request is not None:
+            tasks.add(asyncio.create_task(self._wait_for_disconnect(request)))
+
+        try:
+            done, pending = await asyncio.wait(
+                tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        except asyncio.CancelledError:
+            # Server side cancellation, do not leave the upstream call running
+            for task in tasks:
+                task.cancel()
+            raise
+
+        # Cancel whatever is still running (the upstream call or the disconnect watcher)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if invoke_task in done:
+            return "ok", invoke_task.result()
+        if done:
+            return "cancelled", None
+        return "timeout", None
+
+    async def handle_prompt(self, prompt_name: str, input_data: Any, variables: List[str], api_key: str, request: Optional[Request] = None):
         """Handle prompt execution and tracing"""
         self.logger.info(f"Handling prompt: {prompt_name}")
         try:
@@ -158,8 +224,21 @@ class PromptHandler:
             generation = self._record_generation(trace, prompt_name, model_name, model_params, prompt, input_dict)
 
             # Execute chain
-            self.logger.debug(f"Executing chain for {prompt_name}")
-            response = chain.invoke(input=input_dict)
+            timeout = self._get_timeout(prompt_name, is_chat)
+            self.logger.debug(f"Executing chain for {prompt_name} (timeout={timeout})")
+            status, response = await self._invoke_with_deadline(chain, input_dict, timeout, request)
+
+            if status == "timeout":
+                message = f"Upstream call exceeded the {timeout}s deadline"
+                self.logger.warning(f"Timeout for prompt {prompt_name}: {message}")
+                self._record_abort(trace, generation, status, message)
+                raise HTTPException(status_code=504, detail=message)
+            if status == "cancelled":
+                message = "Client disconnected before the upstream call finished"
+                self.logger.warning(f"Cancelled prompt {prompt_name}: {message}")
+                self._record_abort(trace, generation, status, message)
+                raise HTTPException(status_code=499, detail=message)
+
             generation.end(output=response)
             trace.update(output=response)
 
@@ -167,6 +246,8 @@ class PromptHandler:
 
             return {"response": response} if len(components) == 3 else json.loads(response.content)
 
+        except HTTPException:
+            raise
         except Exception as e:
             tb = traceback.extract_tb(e.__traceback__)
             filename, lineno, _, _ = tb[-1]